@@ -1,49 +1,106 @@
-from flask import Flask, request, jsonify
+from flask import Flask, abort, request
 from flask_cors import CORS
-import uuid, time
+from cachetools import TTLCache
+from threading import RLock
+import hashlib, hmac, orjson, os, secrets, time
 
 app = Flask(__name__)
+MAX_BODY_BYTES = 8 * 1024
+app.config["MAX_CONTENT_LENGTH"] = MAX_BODY_BYTES
 CORS(app)
 
+TOKEN_EXP_SECONDS = 7 * 24 * 3600
+
 users = {}
-sessions = {}
+sessions = TTLCache(maxsize=100_000, ttl=TOKEN_EXP_SECONDS)
+_slock = RLock()
 
 VERSION = "0.1"
 
+INDEX_BODY = orjson.dumps({"message": "Launcher API Online", "version": VERSION})
+PING_BODY = orjson.dumps({"status": "ok", "message": "pong"})
+INDEX_ETAG = hashlib.sha1(INDEX_BODY).hexdigest()
+
+def hash_password(password, salt=None):
+    salt = salt or os.urandom(16)
+    digest = hashlib.scrypt(password.encode(), salt=salt, n=2**14, r=8, p=1)
+    return f"scrypt${salt.hex()}${digest.hex()}"
+
+def check_password(stored, password):
+    salt = bytes.fromhex(stored.split("$")[1])
+    return hmac.compare_digest(stored, hash_password(password, salt))
+
+# Checked against when the username is unknown so both login paths pay for scrypt.
+DUMMY_PASSWORD_HASH = hash_password(secrets.token_urlsafe(16))
+
+def ojsonify(obj):
+    return app.response_class(orjson.dumps(obj), mimetype="application/json")
+
+def static_json(body, etag):
+    resp = app.response_class(body, mimetype="application/json")
+    resp.set_etag(etag)
+    resp.cache_control.public = True
+    resp.cache_control.max_age = 30
+    return resp.make_conditional(request)
+
+def read_json():
+    # Werkzeug < 2.3 only applies MAX_CONTENT_LENGTH to form parsing, and
+    # chunked bodies carry no Content-Length, so bound the read here too.
+    if (request.content_length or 0) > MAX_BODY_BYTES:
+        abort(413)
+    raw = request.stream.read(MAX_BODY_BYTES + 1)
+    if len(raw) > MAX_BODY_BYTES or (len(raw) == MAX_BODY_BYTES and request.stream.read(1)):
+        abort(413)
+    try:
+        data = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
 @app.route("/", methods=["GET"])
 def index():
-    return jsonify({"message": "Launcher API Online", "version": VERSION})
+    return static_json(INDEX_BODY, INDEX_ETAG)
 
 @app.route("/ping", methods=["GET"])
 def ping():
-    return jsonify({"status": "ok", "message": "pong"})
+    resp = app.response_class(PING_BODY, mimetype="application/json")
+    resp.cache_control.no_store = True
+    return resp
 
 @app.route("/register", methods=["POST"])
 def register():
-    data = request.get_json(silent=True) or {}
-    username = (data.get("username") or "").strip()
+    data = read_json()
+    username = data.get("username") or ""
     password = data.get("password") or ""
+    if not isinstance(username, str) or not isinstance(password, str):
+        return ojsonify({"error": "Username and password must be strings"}), 400
+    username = username.strip()
 
     if not username or not password:
-        return jsonify({"error": "Username and password required"}), 400
-    if username in users:
-        return jsonify({"error": "User already exists"}), 400
-    users[username] = {"password": password, "created": int(time.time())}
-    return jsonify({"message": "User registered successfully", "username": username})
+        return ojsonify({"error": "Username and password required"}), 400
+    user = {"password_hash": hash_password(password), "created": int(time.time())}
+    if users.setdefault(username, user) is not user:
+        return ojsonify({"error": "User already exists"}), 400
+    return ojsonify({"message": "User registered successfully", "username": username})
 
 @app.route("/login", methods=["POST"])
 def login():
-    data = request.get_json(silent=True) or {}
-    username = (data.get("username") or "").strip()
+    data = read_json()
+    username = data.get("username") or ""
     password = data.get("password") or ""
+    if not isinstance(username, str) or not isinstance(password, str):
+        return ojsonify({"error": "Username and password must be strings"}), 400
+    username = username.strip()
     if not username or not password:
-        return jsonify({"error": "Username and password required"}), 400
+        return ojsonify({"error": "Username and password required"}), 400
     user = users.get(username)
-    if not user or user.get("password") != password:
-        return jsonify({"error": "Invalid username or password"}), 401
-    token = str(uuid.uuid4())
-    sessions[token] = {"username": username, "created": int(time.time())}
-    return jsonify({"message": "Login successful", "token": token, "username": username})
+    stored = user["password_hash"] if user else DUMMY_PASSWORD_HASH
+    if not check_password(stored, password) or not user:
+        return ojsonify({"error": "Invalid username or password"}), 401
+    token = secrets.token_urlsafe(24)
+    with _slock:
+        sessions[token] = {"username": username, "created": int(time.time())}
+    return ojsonify({"message": "Login successful", "token": token, "username": username})
 
 @app.route("/me", methods=["GET"])
 def me():
@@ -53,18 +110,20 @@ def me():
         token = auth.split(" ", 1)[1].strip()
     if not token:
         token = request.args.get("token")
-    if not token or token not in sessions:
-        return jsonify({"error": "Unauthorized"}), 401
-    username = sessions[token]["username"]
-    return jsonify({"username": username, "message": f"Hello {username}"})
+    with _slock:
+        sess = sessions.get(token) if token else None
+    if not sess:
+        return ojsonify({"error": "Unauthorized"}), 401
+    username = sess["username"]
+    return ojsonify({"username": username, "message": f"Hello {username}"})
 
 @app.route("/logout", methods=["POST"])
 def logout():
-    data = request.get_json(silent=True) or {}
+    data = read_json()
     token = data.get("token") or request.headers.get("Authorization", "").replace("Bearer ", "")
-    if token in sessions:
-        del sessions[token]
-    return jsonify({"message": "Logged out"})
+    with _slock:
+        sessions.pop(token, None)
+    return ojsonify({"message": "Logged out"})
 
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000, debug=True)
@@ -0,0 +1,9 @@
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+# users and sessions live in process memory, so a single worker must own them;
+# concurrency comes from threads instead of extra processes.
+workers = 1
+worker_class = "gthread"
+threads = 8
+preload_app = True